@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Configuration settings loaded from environment / .env file."""
 
+from functools import cached_property
 from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,6 +19,7 @@ class Settings(BaseSettings):
     proxmox_password: str = "changeme"
     proxmox_verify_ssl: bool = False
     proxmox_mock: bool = False  # Set to true for dev without a real Proxmox host
+    proxmox_timeout_s: float = 10.0  # Per-call deadline for upstream Proxmox requests
 
     # NetBox
     netbox_url: str = "http://localhost:8000"
@@ -29,8 +31,10 @@ class Settings(BaseSettings):
     # CORS — comma-separated allowed origins
     api_cors_origins: str = "http://localhost:5173,http://localhost:3000"
 
-    @property
+    @cached_property
     def cors_origins(self) -> List[str]:
+        # Parsed once on first access — settings are immutable after load, so
+        # there is no reason to re-split the string per read.
         return [o.strip() for o in self.api_cors_origins.split(",") if o.strip()]
 
 
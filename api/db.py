@@ -1,12 +1,47 @@
 #!/usr/bin/env python3
 """Async SQLAlchemy database setup."""
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from api.config import settings
 
-engine = create_async_engine(settings.database_url, echo=False)
+_IS_SQLITE = settings.database_url.startswith("sqlite")
+
+if _IS_SQLITE:
+    # aiosqlite is single-file — pool sizing doesn't apply, but a larger
+    # statement cache still saves per-request SQL compilation.
+    engine = create_async_engine(
+        settings.database_url,
+        echo=False,
+        query_cache_size=1200,
+    )
+else:
+    engine = create_async_engine(
+        settings.database_url,
+        echo=False,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=False,
+        # Recycle connections before typical server/LB idle timeouts kill
+        # them; cheaper than a per-checkout SELECT 1 probe.
+        pool_recycle=1800,
+        query_cache_size=1200,
+    )
+
+if _IS_SQLITE:
+    # journal_mode=WAL persists in the database file, but synchronous is
+    # per-connection state — set both on every pooled connection so no
+    # checkout runs at the default FULL fsync-per-transaction.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
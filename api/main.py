@@ -2,11 +2,13 @@
 """Direttore FastAPI application entry point."""
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from api.config import settings
 from api.db import init_db
+from api.proxmox.client import ProxmoxError
 from api.routes import proxmox, reservations, inventory
 
 
@@ -14,6 +16,7 @@ from api.routes import proxmox, reservations, inventory
 async def lifespan(app: FastAPI):
     await init_db()
     yield
+    await inventory.close_nb_client()
 
 
 app = FastAPI(
@@ -21,6 +24,7 @@ app = FastAPI(
     description="Lab infrastructure provisioning and reservation platform",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -31,6 +35,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(ProxmoxError)
+async def proxmox_error_handler(request: Request, exc: ProxmoxError) -> ORJSONResponse:
+    # One place turns upstream Proxmox failures into a 502 — route bodies
+    # stay free of blanket try/except wrappers.
+    return ORJSONResponse(
+        {"detail": proxmox._proxmox_error(exc)}, status_code=502
+    )
+
+
 app.include_router(proxmox.router)
 app.include_router(reservations.router)
 app.include_router(inventory.router)
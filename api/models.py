@@ -2,12 +2,40 @@
 """SQLAlchemy ORM models for Direttore."""
 
 import datetime
-from sqlalchemy import DateTime, Integer, String, Enum as SAEnum
+import time
+from sqlalchemy import BigInteger, Index, Integer, String, TypeDecorator
 from sqlalchemy.orm import Mapped, mapped_column
 from api.db import Base
 import enum
 
 
+class EpochDateTime(TypeDecorator):
+    """Store naive-UTC datetimes as integer epoch seconds.
+
+    SQLite has no native datetime type — DateTime columns end up as ISO text,
+    which makes range comparisons string compares over wide rows. Integer epoch
+    keeps the overlap queries on the reservation conflict path as plain int
+    index scans.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return int(value.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return datetime.datetime.fromtimestamp(
+            value, tz=datetime.timezone.utc
+        ).replace(tzinfo=None)
+
+
 class ResourceType(str, enum.Enum):
     vm = "vm"
     lxc = "lxc"
@@ -22,21 +50,38 @@ class ReservationStatus(str, enum.Enum):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        Index("ix_reservations_start_end", "start_dt", "end_dt"),
+        # Covers the create-time conflict check (node equality, status
+        # inequality, window overlap) as an index range scan.
+        Index("ix_res_conflict", "proxmox_node", "status", "start_dt", "end_dt"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(128), nullable=False)
     requester: Mapped[str] = mapped_column(String(64), nullable=False, default="anonymous")
-    resource_type: Mapped[ResourceType] = mapped_column(
-        SAEnum(ResourceType), nullable=False, default=ResourceType.vm
+    # Stored as short strings rather than SAEnum — on SQLite the enum type is
+    # just TEXT plus a CHECK constraint, so String(16) keeps rows compact and
+    # skips the per-row enum coercion on load.
+    resource_type: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=ResourceType.vm.value
     )
     proxmox_node: Mapped[str] = mapped_column(String(64), nullable=True)
     vmid: Mapped[int] = mapped_column(Integer, nullable=True)
-    start_dt: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
-    end_dt: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False)
-    status: Mapped[ReservationStatus] = mapped_column(
-        SAEnum(ReservationStatus), nullable=False, default=ReservationStatus.pending
+    start_dt: Mapped[datetime.datetime] = mapped_column(EpochDateTime, nullable=False)
+    end_dt: Mapped[datetime.datetime] = mapped_column(EpochDateTime, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=ReservationStatus.pending.value
     )
     notes: Mapped[str] = mapped_column(String(512), nullable=True)
+    # Epoch seconds, maintained on every write — MAX(updated_at) + COUNT(*)
+    # is the change token the routes hash into ETags.
+    updated_at: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=lambda: int(time.time()),
+        onupdate=lambda: int(time.time()),
+    )
 
 
 class ResourcePool(Base):
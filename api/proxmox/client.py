@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
 """Proxmox API client — wraps proxmoxer with mock support."""
 
-from typing import Any, Dict, List
+import asyncio
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Sequence
 from api.config import settings
 
 _proxmox = None
 
 
+class ProxmoxError(Exception):
+    """Raised when an upstream Proxmox call fails.
+
+    Service functions wrap transport/API errors in this so routes (via the
+    app-level exception handler) don't each need a blanket try/except.
+    """
+
+
+async def run_upstream(func, /, *args, **kwargs):
+    """Run a blocking proxmoxer call off-loop, wrapping failures."""
+    try:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    except Exception as e:
+        raise ProxmoxError(str(e)) from e
+
+
 def get_client():
     """Return a cached proxmoxer ProxmoxAPI instance (or None in mock mode)."""
     global _proxmox
@@ -20,14 +38,28 @@ def get_client():
             password=settings.proxmox_password,
             verify_ssl=settings.proxmox_verify_ssl,
         )
+        # The singleton already keeps one requests.Session (so TLS handshakes
+        # are paid once), but its default adapter pools only 10 connections.
+        # Widen it so concurrent to_thread calls don't queue on the pool.
+        # Reaching into the backend is best-effort — skip on layout changes.
+        try:
+            from requests.adapters import HTTPAdapter  # type: ignore
+            session = _proxmox._backend.session
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        except (ImportError, AttributeError):
+            pass
     return _proxmox
 
 
 # ---------------------------------------------------------------------------
-# Mock data — returned when PROXMOX_MOCK=true
+# Mock data — returned when PROXMOX_MOCK=true. Frozen (MappingProxyType +
+# tuples) so rows shared by reference with callers can't be mutated in place;
+# apply_mock_status overlays state copy-on-change instead.
 # ---------------------------------------------------------------------------
 
-MOCK_NODES: List[Dict[str, Any]] = [
+MOCK_NODES: Sequence[Dict[str, Any]] = (
     {
         "node": "pve-01",
         "status": "online",
@@ -50,56 +82,56 @@ MOCK_NODES: List[Dict[str, Any]] = [
         "maxdisk": 549_755_813_888,
         "uptime": 432000,
     },
-]
+)
 
-MOCK_VMS: Dict[str, List[Dict[str, Any]]] = {
-    "pve-01": [
+MOCK_VMS: Mapping[str, Sequence[Dict[str, Any]]] = MappingProxyType({
+    "pve-01": (
         {"vmid": 100, "name": "ubuntu-22-04", "status": "running", "cpus": 4, "maxmem": 4_294_967_296, "uptime": 76400, "type": "qemu"},
         {"vmid": 101, "name": "win2022-template", "status": "stopped", "cpus": 8, "maxmem": 8_589_934_592, "uptime": 0, "type": "qemu"},
         {"vmid": 102, "name": "rocky-linux-9", "status": "running", "cpus": 2, "maxmem": 2_147_483_648, "uptime": 12300, "type": "qemu"},
-    ],
-    "pve-02": [
+    ),
+    "pve-02": (
         {"vmid": 200, "name": "debian-12", "status": "running", "cpus": 2, "maxmem": 2_147_483_648, "uptime": 43200, "type": "qemu"},
         {"vmid": 201, "name": "test-router", "status": "paused", "cpus": 1, "maxmem": 1_073_741_824, "uptime": 0, "type": "qemu"},
-    ],
-}
+    ),
+})
 
-MOCK_LXC: Dict[str, List[Dict[str, Any]]] = {
-    "pve-01": [
+MOCK_LXC: Mapping[str, Sequence[Dict[str, Any]]] = MappingProxyType({
+    "pve-01": (
         {"vmid": 300, "name": "alpine-dns", "status": "running", "cpus": 1, "maxmem": 536_870_912, "uptime": 99000, "type": "lxc"},
         {"vmid": 301, "name": "ubuntu-web", "status": "stopped", "cpus": 2, "maxmem": 1_073_741_824, "uptime": 0, "type": "lxc"},
-    ],
-    "pve-02": [
+    ),
+    "pve-02": (
         {"vmid": 400, "name": "monitoring", "status": "running", "cpus": 2, "maxmem": 2_147_483_648, "uptime": 55000, "type": "lxc"},
-    ],
-}
+    ),
+})
 
-MOCK_TEMPLATES: Dict[str, List[Dict[str, Any]]] = {
-    "pve-01": [
+MOCK_TEMPLATES: Mapping[str, Sequence[Dict[str, Any]]] = MappingProxyType({
+    "pve-01": (
         {"volid": "local:vztmpl/ubuntu-22.04-standard_22.04-1_amd64.tar.gz", "content": "vztmpl", "size": 122_683_392},
         {"volid": "local:vztmpl/debian-12-standard_12.0-1_amd64.tar.gz", "content": "vztmpl", "size": 89_400_320},
         {"volid": "local:iso/ubuntu-22.04.4-live-server-amd64.iso", "content": "iso", "size": 2_100_000_000},
         {"volid": "local:iso/Rocky-9.4-x86_64-minimal.iso", "content": "iso", "size": 1_600_000_000},
-    ],
-    "pve-02": [
+    ),
+    "pve-02": (
         {"volid": "local:vztmpl/alpine-3.18-default_20230901_amd64.tar.xz", "content": "vztmpl", "size": 3_145_728},
-    ],
-}
+    ),
+})
 
-MOCK_NETWORKS: Dict[str, List[Dict[str, Any]]] = {
-    "pve-01": [
+MOCK_NETWORKS: Mapping[str, Sequence[Dict[str, Any]]] = MappingProxyType({
+    "pve-01": (
         {"iface": "vmbr0", "type": "bridge", "active": 1, "comments": "Main LAN bridge"},
         {"iface": "vmbr1", "type": "bridge", "active": 1, "comments": "Lab VLAN trunk"},
         {"iface": "vmbr2", "type": "bridge", "active": 0, "comments": "Storage network (inactive)"},
-    ],
-    "pve-02": [
+    ),
+    "pve-02": (
         {"iface": "vmbr0", "type": "bridge", "active": 1, "comments": "Main LAN bridge"},
         {"iface": "vmbr1", "type": "bridge", "active": 1, "comments": "Lab VLAN trunk"},
-    ],
-}
+    ),
+})
 
-MOCK_STORAGE: Dict[str, List[Dict[str, Any]]] = {
-    "pve-01": [
+MOCK_STORAGE: Mapping[str, Sequence[Dict[str, Any]]] = MappingProxyType({
+    "pve-01": (
         {
             "storage": "local-lvm", "type": "lvmthin", "content": "rootdir,images",
             "avail": 450_000_000_000, "total": 1_099_511_627_776, "enabled": 1,
@@ -112,8 +144,8 @@ MOCK_STORAGE: Dict[str, List[Dict[str, Any]]] = {
             "storage": "ceph-pool", "type": "rbd", "content": "rootdir,images",
             "avail": 2_199_023_255_552, "total": 5_497_558_138_880, "enabled": 1,
         },
-    ],
-    "pve-02": [
+    ),
+    "pve-02": (
         {
             "storage": "local-lvm", "type": "lvmthin", "content": "rootdir,images",
             "avail": 214_748_364_800, "total": 549_755_813_888, "enabled": 1,
@@ -122,12 +154,68 @@ MOCK_STORAGE: Dict[str, List[Dict[str, Any]]] = {
             "storage": "local", "type": "dir", "content": "vztmpl,iso,backup,rootdir",
             "avail": 30_064_771_072, "total": 107_374_182_400, "enabled": 1,
         },
-    ],
-}
+    ),
+})
+
+
+# Mock UPIDs: a monotonically increasing counter formatted into a fixed
+# template — cheaper than hashing a uuid4 per mocked call, and the sequence
+# makes interleaved task logs readable during dev/load tests.
+_mock_task_seq = 0
+
+
+def mock_upid(node: str, action: str) -> str:
+    """Return a unique mock task UPID for a node/action pair."""
+    global _mock_task_seq
+    _mock_task_seq += 1
+    return f"UPID:{node}:mock-{_mock_task_seq:08x}:{action}"
+
+
+# Mock action state — start/stop actions record (node, vmid) tuples here so
+# subsequent listings reflect them without mutating the fixtures above.
+# Tuple-of-(str, int) keys hash cheaply against the interned node names.
+MOCK_RUNNING_VMS: set = set()
+MOCK_STOPPED_VMS: set = set()
+MOCK_RUNNING_LXC: set = set()
+MOCK_STOPPED_LXC: set = set()
+
+
+def record_mock_action(node: str, vmid: int, action: str, kind: str) -> None:
+    """Update the mock running/stopped overlays after a lifecycle action."""
+    running, stopped = (
+        (MOCK_RUNNING_VMS, MOCK_STOPPED_VMS)
+        if kind == "qemu"
+        else (MOCK_RUNNING_LXC, MOCK_STOPPED_LXC)
+    )
+    key = (node, vmid)
+    if action in ("start", "reboot"):
+        running.add(key)
+        stopped.discard(key)
+    elif action in ("stop", "shutdown", "delete"):
+        stopped.add(key)
+        running.discard(key)
+
+
+def apply_mock_status(
+    node: str, rows: Sequence[Dict[str, Any]], running: set, stopped: set
+) -> Sequence[Dict[str, Any]]:
+    """Overlay recorded mock actions onto fixture rows, copy-on-change."""
+    if not running and not stopped:
+        return rows
+    out = []
+    for row in rows:
+        key = (node, row["vmid"])
+        if key in running and row.get("status") != "running":
+            out.append({**row, "status": "running"})
+        elif key in stopped and row.get("status") != "stopped":
+            out.append({**row, "status": "stopped", "uptime": 0})
+        else:
+            out.append(row)
+    return out
 
 
-def get_nodes() -> List[Dict[str, Any]]:
+async def get_nodes() -> Sequence[Dict[str, Any]]:
     if settings.proxmox_mock:
         return MOCK_NODES
     px = get_client()
-    return px.nodes.get()
+    return await run_upstream(px.nodes.get)
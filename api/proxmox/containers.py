@@ -1,41 +1,65 @@
 #!/usr/bin/env python3
 """LXC container operations against Proxmox."""
 
-import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, Sequence
 
 from api.config import settings
-from api.proxmox.client import get_client, MOCK_LXC
+from api.proxmox.client import (
+    MOCK_LXC,
+    MOCK_RUNNING_LXC,
+    MOCK_STOPPED_LXC,
+    apply_mock_status,
+    get_client,
+    mock_upid,
+    record_mock_action,
+    run_upstream,
+)
 
+# Mock mode is fixed for the process lifetime — bind it once at import so
+# the per-call check is a branch on a local constant, not a settings lookup.
+_MOCK = settings.proxmox_mock
 
-def list_containers(node: str) -> List[Dict[str, Any]]:
-    if settings.proxmox_mock:
-        return MOCK_LXC.get(node, [])
+# proxmoxer is sync — blocking calls run via client.run_upstream, matching vms.py.
+
+# Attribute paths for container actions, resolved lazily against the proxmoxer
+# proxy — same shape as vms._VM_ACTION_PATHS, so no per-call dict of five
+# bound methods.
+_LXC_ACTION_PATHS: Dict[str, tuple] = {
+    "start": ("status", "start", "post"),
+    "stop": ("status", "stop", "post"),
+    "reboot": ("status", "reboot", "post"),
+    "shutdown": ("status", "shutdown", "post"),
+    "delete": ("delete",),
+}
+
+
+async def list_containers(node: str) -> Sequence[Dict[str, Any]]:
+    if _MOCK:
+        return apply_mock_status(
+            node, MOCK_LXC.get(node, ()), MOCK_RUNNING_LXC, MOCK_STOPPED_LXC
+        )
     px = get_client()
-    return px.nodes(node).lxc.get()
+    return await run_upstream(px.nodes(node).lxc.get)
 
 
-def create_container(node: str, params: Dict[str, Any]) -> str:
+async def create_container(node: str, params: Dict[str, Any]) -> str:
     """Create an LXC container. Returns UPID."""
-    if settings.proxmox_mock:
-        return f"UPID:{node}:mock-{uuid.uuid4().hex[:8]}:lxccreate"
+    if _MOCK:
+        return mock_upid(node, "lxccreate")
     px = get_client()
-    return px.nodes(node).lxc.post(**params)
+    return await run_upstream(px.nodes(node).lxc.post, **params)
 
 
-def action_container(node: str, vmid: int, action: str) -> str:
+async def action_container(node: str, vmid: int, action: str) -> str:
     """Perform start / stop / reboot / shutdown / delete on a container. Returns UPID."""
-    if settings.proxmox_mock:
-        return f"UPID:{node}:mock-{uuid.uuid4().hex[:8]}:{action}"
-    px = get_client()
-    ct = px.nodes(node).lxc(vmid)
-    dispatch = {
-        "start": ct.status.start.post,
-        "stop": ct.status.stop.post,
-        "reboot": ct.status.reboot.post,
-        "shutdown": ct.status.shutdown.post,
-        "delete": ct.delete,
-    }
-    if action not in dispatch:
+    if _MOCK:
+        record_mock_action(node, vmid, action, "lxc")
+        return mock_upid(node, action)
+    path = _LXC_ACTION_PATHS.get(action)
+    if path is None:
         raise ValueError(f"Unknown container action: {action}")
-    return dispatch[action]()
+    px = get_client()
+    target = px.nodes(node).lxc(vmid)
+    for attr in path:
+        target = getattr(target, attr)
+    return await run_upstream(target)
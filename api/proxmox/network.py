@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 """Network interface listing for a Proxmox node."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Sequence
 from api.config import settings
-from api.proxmox.client import get_client, MOCK_NETWORKS
+from api.proxmox.client import MOCK_NETWORKS, get_client, run_upstream
 
+# Mock mode is fixed for the process lifetime — bind it once at import so
+# the per-call check is a branch on a local constant, not a settings lookup.
+_MOCK = settings.proxmox_mock
 
-def list_networks(node: str) -> List[Dict[str, Any]]:
+
+async def list_networks(node: str) -> Sequence[Dict[str, Any]]:
     """Return bridge-type network interfaces on a node."""
-    if settings.proxmox_mock:
-        return MOCK_NETWORKS.get(node, [])
+    if _MOCK:
+        return MOCK_NETWORKS.get(node, ())
     px = get_client()
-    ifaces = px.nodes(node).network.get()
+    # Sync proxmoxer call — run off-loop, matching the other service modules.
+    ifaces = await run_upstream(px.nodes(node).network.get)
     return [i for i in ifaces if i.get("type") == "bridge"]
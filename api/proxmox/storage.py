@@ -1,22 +1,33 @@
 #!/usr/bin/env python3
 """Storage pool listing for a Proxmox node."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Sequence
 from api.config import settings
-from api.proxmox.client import get_client, MOCK_STORAGE
+from api.proxmox.client import MOCK_STORAGE, get_client, run_upstream
+
+# Mock mode is fixed for the process lifetime — bind it once at import so
+# the per-call check is a branch on a local constant, not a settings lookup.
+_MOCK = settings.proxmox_mock
 
 # Content types that indicate a storage pool can hold VM/CT disks
-_DISK_CONTENT = {"images", "rootdir"}
+_DISK_CONTENT = ("images", "rootdir")
+
+
+def _holds_disks(content_csv: str) -> bool:
+    # Substring scan on the raw CSV — "images"/"rootdir" can't appear as
+    # fragments of other Proxmox content types, so this avoids splitting and
+    # building a set per pool.
+    return "images" in content_csv or "rootdir" in content_csv
 
 
-def list_storage(node: str) -> List[Dict[str, Any]]:
+async def list_storage(node: str) -> Sequence[Dict[str, Any]]:
     """Return storage pools on a node that can hold VM images or CT rootfs."""
-    if settings.proxmox_mock:
-        return MOCK_STORAGE.get(node, [])
+    if _MOCK:
+        return MOCK_STORAGE.get(node, ())
     px = get_client()
-    pools = px.nodes(node).storage.get()
+    # Sync proxmoxer call — run off-loop, matching the other service modules.
+    pools = await run_upstream(px.nodes(node).storage.get)
     return [
         p for p in pools
-        if p.get("enabled", 1) != 0
-        and bool(_DISK_CONTENT & set(p.get("content", "").split(",")))
+        if p.get("enabled", 1) != 0 and _holds_disks(p.get("content", ""))
     ]
@@ -1,23 +1,33 @@
 #!/usr/bin/env python3
 """Retrieve available templates/ISOs from Proxmox storage."""
 
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict, List, Sequence
 
 from api.config import settings
-from api.proxmox.client import get_client, MOCK_TEMPLATES
+from api.proxmox.client import MOCK_TEMPLATES, get_client, run_upstream
 
+# Mock mode is fixed for the process lifetime — bind it once at import so
+# the per-call check is a branch on a local constant, not a settings lookup.
+_MOCK = settings.proxmox_mock
 
-def list_templates(node: str) -> List[Dict[str, Any]]:
+
+async def list_templates(node: str) -> Sequence[Dict[str, Any]]:
     """Return all ISOs and container templates available on the node's local storage."""
-    if settings.proxmox_mock:
-        return MOCK_TEMPLATES.get(node, [])
+    if _MOCK:
+        return MOCK_TEMPLATES.get(node, ())
     px = get_client()
-    # Query both iso and vztmpl content types from local storage
-    items = []
-    for content in ("iso", "vztmpl"):
-        try:
-            results = px.nodes(node).storage("local").content.get(content=content)
-            items.extend(results)
-        except Exception:
-            pass
+    # The iso and vztmpl listings are independent round trips — run both
+    # worker-thread calls concurrently instead of back to back. A failed
+    # content type is skipped, as before.
+    content_get = px.nodes(node).storage("local").content.get
+    batches = await asyncio.gather(
+        run_upstream(content_get, content="iso"),
+        run_upstream(content_get, content="vztmpl"),
+        return_exceptions=True,
+    )
+    items: List[Dict[str, Any]] = []
+    for batch in batches:
+        if not isinstance(batch, BaseException):
+            items.extend(batch)
     return items
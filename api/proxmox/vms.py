@@ -1,53 +1,86 @@
 #!/usr/bin/env python3
 """QEMU VM operations against Proxmox."""
 
-import time
-import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence
 
 from api.config import settings
-from api.proxmox.client import get_client, MOCK_VMS
+from api.proxmox.client import (
+    MOCK_RUNNING_VMS,
+    MOCK_STOPPED_VMS,
+    MOCK_VMS,
+    apply_mock_status,
+    get_client,
+    mock_upid,
+    record_mock_action,
+    run_upstream,
+)
 
+# Mock mode is fixed for the process lifetime — bind it once at import so
+# the per-call check is a branch on a local constant, not a settings lookup.
+_MOCK = settings.proxmox_mock
 
-def list_vms(node: str) -> List[Dict[str, Any]]:
-    if settings.proxmox_mock:
-        return MOCK_VMS.get(node, [])
+# proxmoxer has no async transport — its calls block on requests. Each
+# blocking call runs in a worker thread via client.run_upstream so the event
+# loop keeps serving other requests; building the attribute proxy chain is
+# plain object construction and stays on the loop.
+
+# Attribute paths for VM actions, resolved lazily against the proxmoxer proxy.
+# Hoisted to module scope so action_vm doesn't rebuild a dict of five bound
+# methods on every call.
+_VM_ACTION_PATHS: Dict[str, tuple] = {
+    "start": ("status", "start", "post"),
+    "stop": ("status", "stop", "post"),
+    "reboot": ("status", "reboot", "post"),
+    "shutdown": ("status", "shutdown", "post"),
+    "delete": ("delete",),
+}
+
+
+async def list_vms(node: str) -> Sequence[Dict[str, Any]]:
+    if _MOCK:
+        return apply_mock_status(
+            node, MOCK_VMS.get(node, ()), MOCK_RUNNING_VMS, MOCK_STOPPED_VMS
+        )
     px = get_client()
-    return px.nodes(node).qemu.get()
+    return await run_upstream(px.nodes(node).qemu.get)
 
 
-def create_vm(node: str, params: Dict[str, Any]) -> str:
+async def create_vm(node: str, params: Dict[str, Any]) -> str:
     """Create a QEMU VM and return the UPID task identifier."""
-    if settings.proxmox_mock:
-        task_id = f"UPID:{node}:mock-{uuid.uuid4().hex[:8]}:qmcreate"
-        return task_id
+    if _MOCK:
+        return mock_upid(node, "qmcreate")
     px = get_client()
-    result = px.nodes(node).qemu.post(**params)
+    result = await run_upstream(px.nodes(node).qemu.post, **params)
     return result  # result is the UPID string
 
 
-def action_vm(node: str, vmid: int, action: str) -> str:
+async def action_vm(node: str, vmid: int, action: str) -> str:
     """Perform start / stop / reboot / shutdown / delete on a VM. Returns UPID."""
-    if settings.proxmox_mock:
-        return f"UPID:{node}:mock-{uuid.uuid4().hex[:8]}:{action}"
-    px = get_client()
-    vm = px.nodes(node).qemu(vmid)
-    dispatch = {
-        "start": vm.status.start.post,
-        "stop": vm.status.stop.post,
-        "reboot": vm.status.reboot.post,
-        "shutdown": vm.status.shutdown.post,
-        "delete": vm.delete,
-    }
-    if action not in dispatch:
+    if _MOCK:
+        record_mock_action(node, vmid, action, "qemu")
+        return mock_upid(node, action)
+    path = _VM_ACTION_PATHS.get(action)
+    if path is None:
         raise ValueError(f"Unknown VM action: {action}")
-    return dispatch[action]()
+    px = get_client()
+    target = px.nodes(node).qemu(vmid)
+    for attr in path:
+        target = getattr(target, attr)
+    return await run_upstream(target)
+
+
+async def list_node_tasks(node: str) -> List[Dict[str, Any]]:
+    """List recent tasks on a node — one call can serve many status polls."""
+    if _MOCK:
+        return []
+    px = get_client()
+    return await run_upstream(px.nodes(node).tasks.get, source="all", limit=200)
 
 
-def get_task_status(node: str, upid: str) -> Dict[str, Any]:
+async def get_task_status(node: str, upid: str) -> Dict[str, Any]:
     """Poll task status. In mock mode, simulate completion after a brief delay."""
-    if settings.proxmox_mock:
+    if _MOCK:
         # Simulate progress based on task age embedded in upid (mock always completes)
         return {"upid": upid, "status": "stopped", "exitstatus": "OK", "node": node}
     px = get_client()
-    return px.nodes(node).tasks(upid).status.get()
+    return await run_upstream(px.nodes(node).tasks(upid).status.get)
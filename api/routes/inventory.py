@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """FastAPI router — NetBox inventory proxy."""
 
+import asyncio
+import ipaddress
+import random
+import socket
+import time
 from typing import Any, Dict, List, Optional
 from datetime import datetime
-from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Body, HTTPException, Query
 import httpx
+import orjson
 
 from api.config import settings
 
@@ -13,12 +18,187 @@ router = APIRouter(prefix="/api/inventory", tags=["inventory"])
 
 TIMEOUT = 10  # seconds
 
+# One long-lived client for all NetBox calls — keeps connections pooled and
+# (when NetBox is behind TLS) avoids a handshake per request. HTTP/2 lets the
+# concurrent address + prefix fetches multiplex over a single connection.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_nb_client() -> httpx.AsyncClient:
+    """Return the shared NetBox AsyncClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=settings.netbox_url.rstrip("/"),
+            timeout=httpx.Timeout(TIMEOUT, connect=3.0),
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20,
+                keepalive_expiry=30,
+            ),
+            http2=True,
+        )
+    return _client
+
+
+async def close_nb_client() -> None:
+    """Close the shared client — called from the app lifespan on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# ---------------------------------------------------------------------------
+# TTL cache — NetBox data is read-mostly and the UI polls these endpoints.
+# Keys are built from the known filter params only, so junk query strings
+# can't bloat the cache or leak into NetBox.
+# ---------------------------------------------------------------------------
+
+CACHE_TTL = 30.0   # seconds, list endpoints
+STATUS_TTL = 10.0  # seconds, reachability probe
+
+# The status probe is a liveness check — bound its worst case well below the
+# general 10s budget so a wedged NetBox can't hold the UI poll for that long.
+_STATUS_TIMEOUT = httpx.Timeout(2.0, connect=1.0)
+
+_response_cache: Dict[tuple, tuple] = {}  # key -> (expires_at, value)
+
+
+def _cache_get(key: tuple) -> Optional[Any]:
+    hit = _response_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    return None
+
+
+def _cache_put(key: tuple, value: Any, ttl: float = CACHE_TTL) -> None:
+    if len(_response_cache) > 256:
+        now = time.monotonic()
+        for k in [k for k, (exp, _) in _response_cache.items() if exp <= now]:
+            del _response_cache[k]
+    _response_cache[key] = (time.monotonic() + ttl, value)
+
+
+# Built once at import — the token is fixed for the process lifetime, so
+# there is no reason to re-format the Authorization header per request.
+_NB_HEADERS: Dict[str, str] = {
+    "Authorization": f"Token {settings.netbox_token}",
+    "Accept": "application/json",
+}
+
 
 def _nb_headers() -> Dict[str, str]:
-    return {
-        "Authorization": f"Token {settings.netbox_token}",
-        "Accept": "application/json",
-    }
+    return _NB_HEADERS
+
+
+# Endpoint paths, resolved against the client's base_url — relative paths
+# skip per-request absolute-URL parsing in httpx.
+_URL_STATUS = "/api/status/"
+_URL_DEVICES = "/api/dcim/devices/"
+_URL_PREFIXES = "/api/ipam/prefixes/"
+_URL_IPS = "/api/ipam/ip-addresses/"
+_URL_VLANS = "/api/ipam/vlans/"
+
+
+# ---------------------------------------------------------------------------
+# Reliability — circuit breaker + bounded retry for the NetBox upstream.
+# When NetBox is down, every proxied call would otherwise ride out the full
+# 10s timeout; an open breaker fails those calls in microseconds instead.
+# ---------------------------------------------------------------------------
+
+class _CircuitBreaker:
+    """Minimal CLOSED → OPEN → HALF_OPEN breaker.
+
+    After ``fail_threshold`` consecutive failures the breaker opens and calls
+    fail fast for ``reset_after`` seconds. The first call after that window is
+    the half-open probe: success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, fail_threshold: int = 5, reset_after: float = 30.0):
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        return time.monotonic() - self._opened_at >= self.reset_after
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._failures >= self.fail_threshold:
+            self._opened_at = time.monotonic()
+
+
+_nb_breaker = _CircuitBreaker()
+
+# Statuses worth retrying — transient upstream trouble, not caller error.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 3
+
+
+# Identical concurrent GETs (dashboard tabs polling the same listing) share
+# one upstream round trip — the winner's Response is handed to every waiter.
+_inflight: Dict[tuple, "asyncio.Future"] = {}
+
+
+async def _nb_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+) -> httpx.Response:
+    """Coalescing GET — deduplicates in-flight requests for the same URL+params."""
+    key = (url, tuple(sorted(params.items())) if params else None)
+    # shield: the future is shared, so a cancelled waiter (client disconnect)
+    # must not cancel the NetBox call the other coalesced requests are on.
+    fut = _inflight.get(key)
+    if fut is not None:
+        return await asyncio.shield(fut)
+    fut = asyncio.ensure_future(_nb_get_once(url, params, timeout))
+    _inflight[key] = fut
+    try:
+        return await asyncio.shield(fut)
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _nb_get_once(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+) -> httpx.Response:
+    """GET from NetBox through the breaker, retrying 5xx/429 with full jitter."""
+    if not _nb_breaker.allow():
+        raise HTTPException(
+            status_code=503, detail="NetBox unavailable (circuit breaker open)"
+        )
+    client = get_nb_client()
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            r = await client.get(
+                url, params=params, headers=_NB_HEADERS, timeout=timeout
+            )
+        except httpx.TransportError:
+            _nb_breaker.record_failure()
+            if attempt == _MAX_ATTEMPTS - 1 or not _nb_breaker.allow():
+                raise
+            await asyncio.sleep(random.uniform(0, 0.25 * (2 ** attempt)))
+            continue
+        if r.status_code in _RETRY_STATUSES:
+            _nb_breaker.record_failure()
+            if attempt == _MAX_ATTEMPTS - 1 or not _nb_breaker.allow():
+                return r
+            await asyncio.sleep(random.uniform(0, 0.25 * (2 ** attempt)))
+            continue
+        _nb_breaker.record_success()
+        return r
+    return r  # unreachable, keeps type checkers happy
 
 
 # ---------------------------------------------------------------------------
@@ -30,19 +210,20 @@ async def netbox_status() -> Dict[str, Any]:
     """Quick reachability check against the configured NetBox instance."""
     if not settings.netbox_token:
         return {"reachable": False, "reason": "NETBOX_TOKEN not configured"}
+    cached = _cache_get(("status",))
+    if cached is not None:
+        return cached
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            r = await client.get(
-                f"{settings.netbox_url}/api/status/",
-                headers=_nb_headers(),
-            )
-            r.raise_for_status()
-            data = r.json()
-            return {
-                "reachable": True,
-                "version": data.get("netbox-version", "unknown"),
-                "url": settings.netbox_url,
-            }
+        r = await _nb_get(_URL_STATUS, timeout=_STATUS_TIMEOUT)
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+        result = {
+            "reachable": True,
+            "version": data.get("netbox-version", "unknown"),
+            "url": settings.netbox_url,
+        }
+        _cache_put(("status",), result, ttl=STATUS_TTL)
+        return result
     except Exception as e:
         return {"reachable": False, "reason": str(e)}
 
@@ -54,14 +235,15 @@ async def netbox_status() -> Dict[str, Any]:
 @router.get("/devices")
 async def list_devices() -> List[Dict[str, Any]]:
     """Proxy NetBox device list."""
+    cached = _cache_get(("devices",))
+    if cached is not None:
+        return cached
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            r = await client.get(
-                f"{settings.netbox_url}/api/dcim/devices/",
-                headers=_nb_headers(),
-            )
-            r.raise_for_status()
-            return r.json().get("results", [])
+        r = await _nb_get(_URL_DEVICES)
+        r.raise_for_status()
+        results = orjson.loads(r.content).get("results", [])
+        _cache_put(("devices",), results)
+        return results
     except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"NetBox error: {e}")
 
@@ -70,26 +252,40 @@ async def list_devices() -> List[Dict[str, Any]]:
 # IP Addresses
 # ---------------------------------------------------------------------------
 
+def _nested(d: Dict[str, Any], key: str, field: str, default: str = "") -> Any:
+    """Pull ``d[key][field]`` when d[key] is a dict, else the default.
+
+    Collapses the ``(d.get(k) or {}).get(f, ...)`` pattern without allocating
+    a throwaway dict per miss — these helpers run once per row on 500-row
+    list responses.
+    """
+    v = d.get(key)
+    # NetBox never subclasses dict in these payloads, so the exact-type
+    # check is safe and skips isinstance's subclass walk.
+    return v.get(field, default) if type(v) is dict else default
+
+
 def _slim_ip(addr: Dict[str, Any], gateway: Optional[str]) -> Dict[str, Any]:
     """Return a slim, frontend-friendly representation of a NetBox IP address."""
-    family_val = addr.get("family", {})
+    g = addr.get
+    family_val = g("family")
     family = (
         family_val.get("value")
-        if isinstance(family_val, dict)
+        if type(family_val) is dict
         else family_val
     )
     return {
-        "id": addr.get("id"),
-        "address": addr.get("address"),
+        "id": g("id"),
+        "address": g("address"),
         "family": family,
-        "dns_name": addr.get("dns_name") or "",
-        "description": addr.get("description") or "",
-        "status": (addr.get("status") or {}).get("value", ""),
-        "vrf": (addr.get("vrf") or {}).get("name", "global"),
-        "tags": [t.get("name", "") for t in (addr.get("tags") or [])],
+        "dns_name": g("dns_name") or "",
+        "description": g("description") or "",
+        "status": _nested(addr, "status", "value"),
+        "vrf": _nested(addr, "vrf", "name", "global"),
+        "tags": [t.get("name", "") for t in g("tags") or ()],
         "prefix_gateway": gateway,
         # Custom fields passthrough
-        "custom_fields": addr.get("custom_fields") or {},
+        "custom_fields": g("custom_fields") or {},
     }
 
 
@@ -105,54 +301,127 @@ def _gateway_from_prefix(prefix: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+def _ip_to_int(s: str) -> Optional[tuple]:
+    """Parse an IP string to ``(int_value, bit_width)``, or None if invalid.
+
+    ``inet_pton`` is a thin libc wrapper — far cheaper than constructing an
+    ``ipaddress`` object, and just as strict about malformed input. This runs
+    once per address on the enrichment path.
+    """
+    try:
+        if ":" in s:
+            return int.from_bytes(socket.inet_pton(socket.AF_INET6, s), "big"), 128
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, s), "big"), 32
+    except OSError:
+        return None
+
+
+def _build_gateway_trie(
+    prefixes: List[Dict[str, Any]],
+) -> tuple[Dict, Dict]:
+    """Build per-family binary tries mapping prefixes to their gateways.
+
+    Nodes are dicts keyed by bit (0/1); a ``"gw"`` entry marks the end of an
+    inserted prefix. Each prefix is parsed exactly once here, so lookups never
+    touch ``ip_network`` again.
+    """
+    roots: tuple[Dict, Dict] = ({}, {})
+    for p in prefixes:
+        cidr = p.get("prefix")
+        if not cidr:
+            continue
+        try:
+            net = ipaddress.ip_network(cidr, strict=False)
+        except ValueError:
+            continue
+        node = roots[0] if net.version == 4 else roots[1]
+        net_int = int(net.network_address)
+        top = net.max_prefixlen - 1
+        for i in range(top, top - net.prefixlen, -1):
+            node = node.setdefault((net_int >> i) & 1, {})
+        node["gw"] = _gateway_from_prefix(p)
+    return roots
+
+
+_NB_PAGE = 500  # NetBox's default max page size
+
+
+async def _nb_get_all(url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Fetch every page of a paginated NetBox listing.
+
+    The first page reveals the total count; the remaining offsets are fetched
+    in one concurrent burst over the pooled client rather than one RTT each.
+    """
+    first = await _nb_get(url, params={**params, "limit": _NB_PAGE, "offset": 0})
+    first.raise_for_status()
+    data = orjson.loads(first.content)
+    results = data.get("results", [])
+    count = data.get("count", len(results))
+    if count > _NB_PAGE:
+        pages = await asyncio.gather(
+            *(
+                _nb_get(url, params={**params, "limit": _NB_PAGE, "offset": o})
+                for o in range(_NB_PAGE, count, _NB_PAGE)
+            )
+        )
+        for page in pages:
+            page.raise_for_status()
+            results.extend(orjson.loads(page.content).get("results", []))
+    return results
+
+
+# Prefixes change rarely but every IP listing needs the gateway tries, so a
+# short TTL keeps most listings to a single NetBox call (the addresses).
+_TRIE_TTL = 60.0
+
+
+def invalidate_prefix_cache() -> None:
+    """Drop cached gateway tries — call after mutating prefixes in NetBox."""
+    for key in [k for k in _response_cache if k[0] == "gwtrie"]:
+        del _response_cache[key]
+
+
 async def _bulk_prefix_gateway_map(
-    client: httpx.AsyncClient,
     family: Optional[int] = None,
-) -> Dict[str, Optional[str]]:
+) -> tuple[Dict, Dict]:
     """
-    Fetch all prefixes in one call and return a dict mapping prefix CIDR → gateway.
+    Fetch all prefixes (every page) and return (v4, v6) gateway tries.
     Used to avoid N sequential gateway lookups when enriching IP addresses.
     """
-    params: Dict[str, Any] = {"limit": 500}
+    cache_key = ("gwtrie", family)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    params: Dict[str, Any] = {}
     if family:
         params["family"] = family
     try:
-        r = await client.get(
-            f"{settings.netbox_url}/api/ipam/prefixes/",
-            params=params,
-            headers=_nb_headers(),
-        )
-        r.raise_for_status()
-        return {
-            p["prefix"]: _gateway_from_prefix(p)
-            for p in r.json().get("results", [])
-            if p.get("prefix")
-        }
+        tries = _build_gateway_trie(await _nb_get_all(_URL_PREFIXES, params))
     except Exception:
-        return {}
+        return ({}, {})
+    _cache_put(cache_key, tries, ttl=_TRIE_TTL)
+    return tries
 
 
-def _match_gateway(address: str, prefix_gw_map: Dict[str, Optional[str]]) -> Optional[str]:
+def _match_gateway(address: str, tries: tuple[Dict, Dict]) -> Optional[str]:
     """
-    In-process longest-prefix match: given an IP address (no mask) find the
-    most specific prefix from prefix_gw_map and return its gateway.
-    Falls back to None if no match or no gateway stored.
+    In-process longest-prefix match: walk the address's bits MSB-first down
+    the family's trie, keeping the gateway of the deepest prefix passed.
+    O(address width) regardless of how many prefixes NetBox holds. Falls back
+    to None if no match or no gateway stored.
     """
-    import ipaddress
-    try:
-        ip_obj = ipaddress.ip_address(address)
-    except ValueError:
+    parsed = _ip_to_int(address)
+    if parsed is None:
         return None
-    best: Optional[str] = None
-    best_len = -1
-    for cidr, gw in prefix_gw_map.items():
-        try:
-            net = ipaddress.ip_network(cidr, strict=False)
-            if ip_obj in net and net.prefixlen > best_len:
-                best = gw
-                best_len = net.prefixlen
-        except ValueError:
-            continue
+    ip_int, width = parsed
+    node = tries[0] if width == 32 else tries[1]
+    best = node.get("gw") if "gw" in node else None
+    for i in range(width - 1, -1, -1):
+        node = node.get((ip_int >> i) & 1)
+        if node is None:
+            break
+        if "gw" in node:
+            best = node["gw"]
     return best
 
 
@@ -179,26 +448,20 @@ async def list_ip_addresses(
         params["dns_name__ic"] = dns_name
 
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            # Run IP fetch and prefix map fetch concurrently
-            import asyncio
-            addrs_resp, prefix_gw_map = await asyncio.gather(
-                client.get(
-                    f"{settings.netbox_url}/api/ipam/ip-addresses/",
-                    params=params,
-                    headers=_nb_headers(),
-                ),
-                _bulk_prefix_gateway_map(client, family),
+        # Run IP fetch and prefix map fetch concurrently
+        addrs_resp, gw_tries = await asyncio.gather(
+            _nb_get(_URL_IPS, params=params),
+            _bulk_prefix_gateway_map(family),
+        )
+        addrs_resp.raise_for_status()
+        # Single pass: decode, match and slim without intermediate lists.
+        return [
+            _slim_ip(
+                a,
+                _match_gateway((a.get("address") or "").split("/", 1)[0], gw_tries),
             )
-            addrs_resp.raise_for_status()
-            addrs = addrs_resp.json().get("results", [])
-
-            results: List[Dict[str, Any]] = []
-            for addr in addrs:
-                raw_ip = (addr.get("address") or "").split("/")[0]
-                gw = _match_gateway(raw_ip, prefix_gw_map)
-                results.append(_slim_ip(addr, gw))
-            return results
+            for a in orjson.loads(addrs_resp.content).get("results", [])
+        ]
     except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"NetBox error: {e}")
 
@@ -209,7 +472,8 @@ async def list_ip_addresses(
 
 def _slim_prefix(p: Dict[str, Any]) -> Dict[str, Any]:
     """Return a slim prefix representation including gateway and DNS hints."""
-    cf = p.get("custom_fields") or {}
+    g = p.get
+    cf = g("custom_fields") or {}
     # Try common custom field names for gateway and DNS
     gw = None
     for key in ("gateway", "default_gateway", "gw"):
@@ -220,22 +484,22 @@ def _slim_prefix(p: Dict[str, Any]) -> Dict[str, Any]:
     if isinstance(dns_servers, list):
         dns_servers = " ".join(str(d) for d in dns_servers)
 
-    family_val = p.get("family", {})
+    family_val = g("family")
     family = (
         family_val.get("value")
-        if isinstance(family_val, dict)
+        if type(family_val) is dict
         else family_val
     )
     return {
-        "id": p.get("id"),
-        "prefix": p.get("prefix"),
+        "id": g("id"),
+        "prefix": g("prefix"),
         "family": family,
-        "status": (p.get("status") or {}).get("value", ""),
-        "vrf": (p.get("vrf") or {}).get("name", "global"),
-        "description": p.get("description") or "",
-        "site": (p.get("site") or {}).get("name", ""),
-        "role": (p.get("role") or {}).get("name", ""),
-        "tags": [t.get("name", "") for t in (p.get("tags") or [])],
+        "status": _nested(p, "status", "value"),
+        "vrf": _nested(p, "vrf", "name", "global"),
+        "description": g("description") or "",
+        "site": _nested(p, "site", "name"),
+        "role": _nested(p, "role", "name"),
+        "tags": [t.get("name", "") for t in g("tags") or ()],
         "gateway": gw,
         "dns_servers": dns_servers,
         "custom_fields": cf,
@@ -258,85 +522,111 @@ async def list_prefixes(
     if site:
         params["site"] = site
 
+    cache_key = ("prefixes", family, status, site, limit)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            r = await client.get(
-                f"{settings.netbox_url}/api/ipam/prefixes/",
-                params=params,
-                headers=_nb_headers(),
-            )
-            r.raise_for_status()
-            return [_slim_prefix(p) for p in r.json().get("results", [])]
+        r = await _nb_get(_URL_PREFIXES, params=params)
+        r.raise_for_status()
+        results = [_slim_prefix(p) for p in orjson.loads(r.content).get("results", [])]
+        _cache_put(cache_key, results)
+        return results
     except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"NetBox error: {e}")
 
-from pydantic import BaseModel
-from datetime import datetime
-
-class AllocateIPRequest(BaseModel):
-    description: Optional[str] = None
-
 @router.post("/prefixes/{prefix_id}/allocate")
-async def allocate_prefix_ip(prefix_id: int, req: AllocateIPRequest) -> Dict[str, Any]:
-    """Allocate the next available IP inside a specific prefix in NetBox."""
-    desc = req.description or f"Allocated by Direttore on {datetime.now().isoformat()}"
+async def allocate_prefix_ip(
+    prefix_id: int,
+    description: Optional[str] = Body(None, embed=True),
+    count: int = Body(1, embed=True, ge=1, le=32),
+) -> Any:
+    """Allocate the next available IP(s) inside a specific prefix in NetBox.
+
+    With ``count`` > 1 the chosen addresses are created in one bulk POST, so
+    provisioning a multi-NIC host costs the same round trips as a single
+    allocation. Returns a single object for ``count=1`` (the historical
+    shape) and a list otherwise.
+    """
+    # `or` short-circuits, so the clock read only happens when the caller
+    # omitted a description; second resolution is plenty for an audit note.
+    desc = description or (
+        f"Allocated by Direttore on {datetime.now().isoformat(timespec='seconds')}"
+    )
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            # Fetch the prefix first to get any statically defined gateway
-            prefix_r = await client.get(
-                f"{settings.netbox_url}/api/ipam/prefixes/{prefix_id}/",
-                headers=_nb_headers()
-            )
-            gate = None
-            if prefix_r.status_code == 200:
-                p_data = _slim_prefix(prefix_r.json())
-                gate = p_data.get("gateway")
-
-            data = None
-            for _ in range(10):  # Retry loop to skip network/gateway addresses
-                r = await client.post(
-                    f"{settings.netbox_url}/api/ipam/prefixes/{prefix_id}/available-ips/",
-                    json={"description": desc},
-                    headers=_nb_headers(),
-                )
-                r.raise_for_status()
-                data = r.json()
-                if isinstance(data, list) and len(data) > 0:
-                    data = data[0]
-                
-                raw_ip = data.get("address", "").split("/")[0]
-                is_network = raw_ip.endswith("::") or raw_ip.endswith(".0")
-                is_potential_gw = raw_ip.endswith("::1") or raw_ip.endswith(".1")
-                
-                skip_msg = None
-                
-                if is_network:
-                    skip_msg = "Reserved (Network address skipped by Direttore)"
-                elif is_potential_gw:
-                    if gate:
-                        # Gateway already specified elsewhere, just skip this IP
-                        skip_msg = "Reserved (skipped ::1 or .1 by Direttore)"
-                    else:
-                        # No gateway specified! Let's assume this IS the gateway.
-                        skip_msg = "Allocated as gateway by Direttore"
-                        gate = raw_ip  # We assume this is the gateway now!
-                
-                if skip_msg:
-                    # Burn this address: update description so it's not reused
-                    ip_id = data.get("id")
-                    if ip_id:
-                        await client.patch(
-                            f"{settings.netbox_url}/api/ipam/ip-addresses/{ip_id}/",
-                            json={"description": skip_msg},
-                            headers=_nb_headers()
-                        )
-                    continue  # Try allocating the next one
-                break  # Good address found!
-
-            if not data:
-                raise HTTPException(status_code=502, detail="Exhausted available IPs while skipping network/gateway addresses.")
-
-            return _slim_ip(data, gateway=gate)
+        client = get_nb_client()
+        # The prefix fetch (for the stored gateway) and the candidate
+        # enumeration are independent — run them concurrently to shave one
+        # NetBox round trip off the critical path. The candidate enumeration
+        # bypasses the coalescer: two concurrent allocations sharing one
+        # available-ips response would both pick — and create — the same
+        # addresses. Coalescing is only safe for read-for-display traffic.
+        prefix_r, avail_r = await asyncio.gather(
+            _nb_get(f"{_URL_PREFIXES}{prefix_id}/"),
+            _nb_get_once(
+                f"{_URL_PREFIXES}{prefix_id}/available-ips/",
+                params={"limit": count + 8},
+            ),
+        )
+        gate = None
+        net = None
+        if prefix_r.status_code == 200:
+            p_data = _slim_prefix(orjson.loads(prefix_r.content))
+            gate = p_data.get("gateway")
+            try:
+                net = ipaddress.ip_network(p_data.get("prefix"), strict=False)
+            except (TypeError, ValueError):
+                net = None
+
+        # Candidates were enumerated without reserving them — pick locally,
+        # then create the chosen addresses in one POST. No reserve-then-burn.
+        avail_r.raise_for_status()
+        candidates = orjson.loads(avail_r.content)
+
+        # Classify candidates against the prefix's network address as integers
+        # — suffix matching on the text form misfires on addresses like
+        # 2001:db8::10 and can't tell .1 in a /31 from a real gateway slot.
+        net_addr = int(net.network_address) if net is not None else None
+        chosen: List[Dict[str, Any]] = []
+        for cand in candidates:
+            raw_ip = (cand.get("address") or "").split("/", 1)[0]
+            parsed = _ip_to_int(raw_ip)
+            if parsed is None:
+                continue
+            ip_int = parsed[0]
+            if net_addr is not None:
+                if ip_int == net_addr:
+                    continue  # network address
+                if ip_int == net_addr + 1:
+                    if not gate:
+                        # No gateway recorded on the prefix — assume this is
+                        # it and keep it out of the allocation pool.
+                        gate = raw_ip
+                    continue
+            elif raw_ip.endswith("::") or raw_ip.endswith(".0") or raw_ip.endswith("::1") or raw_ip.endswith(".1"):
+                # Prefix lookup failed — fall back to the old text heuristic.
+                continue
+            chosen.append(cand)
+            if len(chosen) == count:
+                break
+
+        if len(chosen) < count:
+            raise HTTPException(status_code=502, detail="Exhausted available IPs while skipping network/gateway addresses.")
+
+        # NetBox bulk-creates when the body is a list — one POST either way.
+        payload: Any = [{"address": c["address"], "description": desc} for c in chosen]
+        if count == 1:
+            payload = payload[0]
+        r = await client.post(
+            _URL_IPS,
+            json=payload,
+            headers=_nb_headers(),
+        )
+        r.raise_for_status()
+        created = orjson.loads(r.content)
+        if count == 1:
+            return _slim_ip(created, gateway=gate)
+        return [_slim_ip(c, gateway=gate) for c in created]
     except httpx.HTTPError as e:
         detail = str(e)
         if hasattr(e, "response") and e.response is not None:
@@ -353,17 +643,18 @@ async def allocate_prefix_ip(prefix_id: int, req: AllocateIPRequest) -> Dict[str
 
 def _slim_vlan(v: Dict[str, Any]) -> Dict[str, Any]:
     """Return a slim VLAN representation."""
+    g = v.get
     return {
-        "id": v.get("id"),
-        "vid": v.get("vid"),
-        "name": v.get("name") or "",
-        "status": (v.get("status") or {}).get("value", ""),
-        "site": (v.get("site") or {}).get("name", ""),
-        "group": (v.get("group") or {}).get("name", ""),
-        "role": (v.get("role") or {}).get("name", ""),
-        "description": v.get("description") or "",
-        "tags": [t.get("name", "") for t in (v.get("tags") or [])],
-        "custom_fields": v.get("custom_fields") or {},
+        "id": g("id"),
+        "vid": g("vid"),
+        "name": g("name") or "",
+        "status": _nested(v, "status", "value"),
+        "site": _nested(v, "site", "name"),
+        "group": _nested(v, "group", "name"),
+        "role": _nested(v, "role", "name"),
+        "description": g("description") or "",
+        "tags": [t.get("name", "") for t in g("tags") or ()],
+        "custom_fields": g("custom_fields") or {},
     }
 
 
@@ -389,14 +680,15 @@ async def list_vlans(
     if q:
         params["q"] = q
 
+    cache_key = ("vlans", site, group, role, status, q, limit)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            r = await client.get(
-                f"{settings.netbox_url}/api/ipam/vlans/",
-                params=params,
-                headers=_nb_headers(),
-            )
-            r.raise_for_status()
-            return [_slim_vlan(v) for v in r.json().get("results", [])]
+        r = await _nb_get(_URL_VLANS, params=params)
+        r.raise_for_status()
+        results = [_slim_vlan(v) for v in orjson.loads(r.content).get("results", [])]
+        _cache_put(cache_key, results)
+        return results
     except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"NetBox error: {e}")
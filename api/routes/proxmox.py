@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 """FastAPI router — Proxmox nodes, VMs, containers, networks, storage, task polling."""
 
-from typing import Any, Dict, List, Literal, Optional
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-
+import asyncio
+import hashlib
+import re
+import time
+from itertools import chain
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+from api.config import settings
 from api.proxmox import client as px_client
 from api.proxmox import vms as px_vms
 from api.proxmox import containers as px_ct
@@ -14,70 +21,256 @@ from api.proxmox import storage as px_stor
 
 router = APIRouter(prefix="/api/proxmox", tags=["proxmox"])
 
+# One shared Literal for VM and LXC lifecycle actions — a single validator
+# is built for both routes instead of one per duplicated annotation.
+Action = Literal["start", "stop", "reboot", "shutdown", "delete"]
+
+
+# Compiled once — _proxmox_error sits on every error path and re.compile
+# per call (plus the import) was pure overhead.
+_ERRORS_RE = re.compile(r'"errors":\s*(\{[^}]+\})')
+_MSG_RE = re.compile(r'"message":\s*"([^"]+)"')
+
 
 def _proxmox_error(e: Exception) -> str:
     """Extract a readable error message from a proxmoxer or generic exception."""
     # proxmoxer wraps HTTP errors — the response body is usually in str(e)
     msg = str(e)
-    # Try to pull Proxmox's JSON "errors" or "message" field out if present
-    import re
-    m = re.search(r'"errors":\s*(\{[^}]+\})', msg)
-    if m:
-        return f"Proxmox error: {m.group(1)}"
+    # Cheap substring probe before the regexes; most errors carry no JSON body.
+    if '"errors"' in msg:
+        m = _ERRORS_RE.search(msg)
+        if m:
+            return f"Proxmox error: {m.group(1)}"
+    if '"message"' in msg:
+        m = _MSG_RE.search(msg)
+        if m:
+            return f"Proxmox error: {m.group(1)}"
     return msg
 
 
+async def _bounded(coro):
+    """Run an upstream call under the configured deadline.
+
+    A hung Proxmox node otherwise holds the handler (and its to_thread worker)
+    for as long as the TCP stack allows; this converts that into a 504 after
+    ``settings.proxmox_timeout_s``.
+    """
+    try:
+        async with asyncio.timeout(settings.proxmox_timeout_s):
+            return await coro
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Proxmox upstream timeout")
+
+
+# Single-flight map: concurrent identical GETs (several dashboard tabs
+# polling the same node) share one upstream Proxmox call instead of each
+# spawning their own.
+_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+async def _singleflight(key: str, coro_fn) -> Any:
+    # shield: the future is shared, so one waiter being cancelled (client
+    # disconnect, _bounded timeout) must not cancel the upstream call out
+    # from under the others. The cancelled waiter still raises CancelledError.
+    fut = _inflight.get(key)
+    if fut is not None:
+        return await asyncio.shield(fut)
+    fut = asyncio.ensure_future(coro_fn())
+    _inflight[key] = fut
+    try:
+        return await asyncio.shield(fut)
+    finally:
+        _inflight.pop(key, None)
+
+
+# Known-node names, refreshed at most every 30s — rejecting a bad {node}
+# path param locally beats letting the Proxmox call fail after a round trip.
+_NODES_TTL = 30.0
+_nodes_cache: tuple = (0.0, frozenset())  # (expires_at, names)
+
+
+async def valid_node(node: str) -> str:
+    """Path-param dependency: 404 unknown node names before any upstream call."""
+    global _nodes_cache
+    expires, names = _nodes_cache
+    if expires <= time.monotonic():
+        try:
+            nodes = await _singleflight("nodes", px_client.get_nodes)
+        except Exception:
+            # Can't list nodes right now — let the real call surface the error.
+            return node
+        names = frozenset(n["node"] for n in nodes)
+        _nodes_cache = (time.monotonic() + _NODES_TTL, names)
+    if names and node not in names:
+        raise HTTPException(status_code=404, detail=f"Unknown node: {node}")
+    return node
+
+
+# Short-TTL response cache over the list GETs. VM/LXC/node listings change
+# when actions run, so they get a 2s window; storage, bridges and templates
+# drift on human timescales and can hold for a minute. Mutation handlers
+# invalidate their node's keys so the UI sees its own writes.
+_LIST_TTL_FAST = 2.0
+_LIST_TTL_SLOW = 60.0
+_TEMPLATES_TTL = 300.0  # ISOs/CT templates change on human timescales
+
+_list_cache: Dict[str, tuple] = {}  # key -> (expires_at, value)
+
+
+async def _cached(key: str, ttl: float, coro_fn) -> Any:
+    hit = _list_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    value = await _singleflight(key, coro_fn)
+    _list_cache[key] = (time.monotonic() + ttl, value)
+    return value
+
+
+def _invalidate(*keys: str) -> None:
+    for key in keys:
+        _list_cache.pop(key, None)
+
+
+# Cluster metadata changes slowly; let the frontend revalidate cheaply.
+_CACHE_CONTROL = "max-age=5, stale-while-revalidate=30"
+
+
+def _etag_response(request: Request, payload: Any) -> Response:
+    """Serialize a read-only payload with a strong ETag, honoring If-None-Match.
+
+    Repeat polls from the dashboard then cost a 304 with no body instead of
+    re-serializing (and re-sending) the full listing every few seconds.
+    """
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _accepted(response: Response, node: str, upid: str) -> None:
+    """Point a 202 response at its task-poll URL per async request-reply."""
+    response.headers["Location"] = f"/api/proxmox/tasks/{node}/{upid}"
+    response.headers["Retry-After"] = "1"
+
+
 # ---------------------------------------------------------------------------
 # Nodes
 # ---------------------------------------------------------------------------
 
 @router.get("/nodes")
-def get_nodes() -> List[Dict[str, Any]]:
+async def get_nodes(request: Request) -> Response:
     """List all Proxmox nodes with resource summary."""
-    try:
-        return px_client.get_nodes()
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    return _etag_response(
+        request, await _bounded(_cached("nodes", _LIST_TTL_FAST, px_client.get_nodes))
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cluster overview
+# ---------------------------------------------------------------------------
+
+# Bounds the per-node fan-out so a big cluster can't flood Proxmox (or the
+# to_thread worker pool) with dozens of simultaneous listings.
+_overview_sem = asyncio.Semaphore(8)
+
+
+async def _node_snapshot(node: str) -> Dict[str, Any]:
+    """Gather a node's VM/LXC/storage/network listings concurrently."""
+    # The deadline sits inside the semaphore so queueing behind other nodes
+    # doesn't count against it — without it one hung node (proxmoxer sets no
+    # socket timeout) hangs /overview indefinitely.
+    async with _overview_sem:
+        vms, lxc, storage, networks, templates = await _bounded(
+            asyncio.gather(
+                px_vms.list_vms(node),
+                px_ct.list_containers(node),
+                px_stor.list_storage(node),
+                px_net.list_networks(node),
+                px_tmpl.list_templates(node),
+            )
+        )
+    return {
+        "node": node,
+        "vms": vms,
+        "lxc": lxc,
+        "storage": storage,
+        "networks": networks,
+        "templates": templates,
+    }
+
+
+@router.get("/overview")
+async def get_overview() -> Dict[str, Any]:
+    """Aggregated cluster view: every node's listings in one response.
+
+    Replaces the dashboard's 1 + 4·N request fan-out with a single call whose
+    wall time is one round of Proxmox latency, not N of them.
+    """
+    nodes = await _bounded(px_client.get_nodes())
+    snapshots = await asyncio.gather(*(_node_snapshot(n["node"]) for n in nodes))
+    return {"nodes": nodes, "resources": snapshots}
 
 
 # ---------------------------------------------------------------------------
 # Networks
 # ---------------------------------------------------------------------------
 
-@router.get("/nodes/{node}/networks")
-def get_networks(node: str) -> List[Dict[str, Any]]:
+@router.get("/nodes/{node}/networks", dependencies=[Depends(valid_node)])
+async def get_networks(request: Request, node: str) -> Response:
     """List bridge-type network interfaces available on a node."""
-    try:
-        return px_net.list_networks(node)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    return _etag_response(
+        request,
+        await _bounded(
+            _cached(
+                f"networks:{node}",
+                _LIST_TTL_SLOW,
+                lambda: px_net.list_networks(node),
+            )
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Storage
 # ---------------------------------------------------------------------------
 
-@router.get("/nodes/{node}/storage")
-def get_storage(node: str) -> List[Dict[str, Any]]:
+@router.get("/nodes/{node}/storage", dependencies=[Depends(valid_node)])
+async def get_storage(request: Request, node: str) -> Response:
     """List storage pools on a node that support VM images or CT rootfs."""
-    try:
-        return px_stor.list_storage(node)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    return _etag_response(
+        request,
+        await _bounded(
+            _cached(
+                f"storage:{node}",
+                _LIST_TTL_SLOW,
+                lambda: px_stor.list_storage(node),
+            )
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
 # VMs
 # ---------------------------------------------------------------------------
 
-@router.get("/nodes/{node}/vms")
-def get_vms(node: str) -> List[Dict[str, Any]]:
+@router.get("/nodes/{node}/vms", dependencies=[Depends(valid_node)])
+async def get_vms(request: Request, node: str) -> Response:
     """List all QEMU VMs on a node."""
-    return px_vms.list_vms(node)
+    return _etag_response(
+        request, await _bounded(
+            _cached(f"vms:{node}", _LIST_TTL_FAST, lambda: px_vms.list_vms(node))
+        )
+    )
 
 
 class NICConfig(BaseModel):
     """Network interface configuration for a QEMU VM."""
+    # Frozen + closed models validate through pydantic-core's fast path and
+    # reject junk fields instead of silently dropping them.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     bridge: str = "vmbr0"
     model: str = "virtio"           # virtio | e1000 | rtl8139
     vlan: Optional[int] = Field(None, ge=1, le=4094)  # VLAN tag (None = untagged)
@@ -90,10 +283,10 @@ class NICConfig(BaseModel):
 
     def to_proxmox_net_string(self) -> str:
         """Return the net{n} parameter value for the Proxmox API."""
-        s = f"{self.model},bridge={self.bridge}"
+        parts = [self.model, f"bridge={self.bridge}"]
         if self.vlan is not None:
-            s += f",tag={self.vlan}"
-        return s
+            parts.append(f"tag={self.vlan}")
+        return ",".join(parts)
 
     def to_proxmox_ipconfig_string(self) -> Optional[str]:
         """
@@ -124,6 +317,8 @@ class NICConfig(BaseModel):
 
 
 class CreateVMRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     vmid: int
     name: str
     cores: int = 2
@@ -135,60 +330,75 @@ class CreateVMRequest(BaseModel):
     ostype: str = "l26"
     start_after_create: bool = False
 
+    def to_proxmox_params(self) -> Dict[str, Any]:
+        """Build the qemu creation parameter dict for the Proxmox API.
 
-@router.post("/nodes/{node}/vms", status_code=202)
-def create_vm(node: str, req: CreateVMRequest) -> Dict[str, Any]:
+        The field names here don't map 1:1 onto API parameters (disk/storage
+        fold into scsi0, NICs become net{n}), so this stays an explicit
+        literal rather than a model_dump post-process. ipconfig{n} is omitted
+        for VMs — it is a cloud-init-only parameter and causes Proxmox to
+        reject creation requests for ISO-based VMs. nameserver is also
+        LXC-only.
+        """
+        params: Dict[str, Any] = {
+            "vmid": self.vmid,
+            "name": self.name,
+            "cores": self.cores,
+            "memory": self.memory,
+            "ostype": self.ostype,
+            **{
+                f"net{idx}": nic.to_proxmox_net_string()
+                for idx, nic in enumerate(self.nics)
+            },
+        }
+        if self.iso:
+            params["cdrom"] = self.iso
+            params["scsi0"] = f"{self.storage}:vm-{self.vmid}-disk-0,size={self.disk}"
+        return params
+
+
+@router.post("/nodes/{node}/vms", status_code=202, dependencies=[Depends(valid_node)])
+async def create_vm(node: str, req: CreateVMRequest, response: Response) -> Dict[str, Any]:
     """Create a new QEMU VM. Returns task UPID."""
-    params: Dict[str, Any] = {
-        "vmid": req.vmid,
-        "name": req.name,
-        "cores": req.cores,
-        "memory": req.memory,
-        "ostype": req.ostype,
-    }
-    # Attach NICs (net0, net1, …). ipconfig{n} is omitted for VMs — it is a
-    # cloud-init-only parameter and causes Proxmox to reject creation requests
-    # for ISO-based VMs. nameserver is also LXC-only for the same reason.
-    for idx, nic in enumerate(req.nics):
-        params[f"net{idx}"] = nic.to_proxmox_net_string()
-
-    if req.iso:
-        params["cdrom"] = req.iso
-        params["scsi0"] = f"{req.storage}:vm-{req.vmid}-disk-0,size={req.disk}"
-
-    try:
-        upid = px_vms.create_vm(node, params)
-        return {"upid": upid, "node": node, "vmid": req.vmid}
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=_proxmox_error(e))
+    upid = await _bounded(px_vms.create_vm(node, req.to_proxmox_params()))
+    _invalidate(f"vms:{node}")
+    _accepted(response, node, upid)
+    return {"upid": upid, "node": node, "vmid": req.vmid}
 
 
-@router.post("/nodes/{node}/vms/{vmid}/{action}", status_code=202)
-def vm_action(
+@router.post("/nodes/{node}/vms/{vmid}/{action}", status_code=202, dependencies=[Depends(valid_node)])
+async def vm_action(
     node: str,
     vmid: int,
-    action: Literal["start", "stop", "reboot", "shutdown", "delete"],
+    action: Action,
+    response: Response,
 ) -> Dict[str, Any]:
     """Start, stop, reboot, shutdown, or delete a VM."""
-    try:
-        upid = px_vms.action_vm(node, vmid, action)
-        return {"upid": upid, "node": node, "vmid": vmid, "action": action}
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    upid = await _bounded(px_vms.action_vm(node, vmid, action))
+    _invalidate(f"vms:{node}")
+    _accepted(response, node, upid)
+    return {"upid": upid, "node": node, "vmid": vmid, "action": action}
 
 
 # ---------------------------------------------------------------------------
 # LXC Containers
 # ---------------------------------------------------------------------------
 
-@router.get("/nodes/{node}/lxc")
-def get_containers(node: str) -> List[Dict[str, Any]]:
+@router.get("/nodes/{node}/lxc", dependencies=[Depends(valid_node)])
+async def get_containers(request: Request, node: str) -> Response:
     """List all LXC containers on a node."""
-    return px_ct.list_containers(node)
+    return _etag_response(
+        request,
+        await _bounded(
+            _cached(f"lxc:{node}", _LIST_TTL_FAST, lambda: px_ct.list_containers(node))
+        ),
+    )
 
 
 class LXCNICConfig(BaseModel):
     """Network interface configuration for an LXC container."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str = "eth0"              # interface name inside container
     bridge: str = "vmbr0"
     ip: str = "dhcp"                # "dhcp" | "x.x.x.x/prefix"
@@ -202,25 +412,27 @@ class LXCNICConfig(BaseModel):
         """Build the Proxmox net{n} string for this LXC NIC."""
         # Use unique interface names: eth0, eth1, … based on the NIC position
         iface_name = self.name if iface_index == 0 else f"eth{iface_index}"
-        s = f"name={iface_name},bridge={self.bridge},ip={self.ip}"
-        
+        parts = [f"name={iface_name}", f"bridge={self.bridge}", f"ip={self.ip}"]
+
         # Don't append gw if ip is auto or dhcp
         if self.gw and self.ip not in ("dhcp", "auto"):
-            s += f",gw={self.gw}"
+            parts.append(f"gw={self.gw}")
 
         if self.ip6:
             val = "dhcp" if self.ip6 == "dhcp6" else self.ip6
-            s += f",ip6={val}"
+            parts.append(f"ip6={val}")
             # Don't append gw6 if ip6 is auto or dhcp
             if self.gw6 and self.ip6 not in ("dhcp", "dhcp6", "auto"):
-                s += f",gw6={self.gw6}"
-                
+                parts.append(f"gw6={self.gw6}")
+
         if self.vlan is not None:
-            s += f",tag={self.vlan}"
-        return s
+            parts.append(f"tag={self.vlan}")
+        return ",".join(parts)
 
 
 class CreateLXCRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     vmid: int
     hostname: str
     cores: int = 1
@@ -234,71 +446,273 @@ class CreateLXCRequest(BaseModel):
     unprivileged: bool = True
     start_after_create: bool = True
 
-
-@router.post("/nodes/{node}/lxc", status_code=202)
-def create_container(node: str, req: CreateLXCRequest) -> Dict[str, Any]:
+    def to_proxmox_params(self) -> Dict[str, Any]:
+        """Build the LXC creation parameter dict for the Proxmox API."""
+        params: Dict[str, Any] = {
+            "vmid": self.vmid,
+            "hostname": self.hostname,
+            "cores": self.cores,
+            "memory": self.memory,
+            "swap": self.swap,
+            "rootfs": f"{self.storage}:{self.disk_size}",
+            "ostemplate": self.template,
+            "password": self.password,
+            "unprivileged": 1 if self.unprivileged else 0,
+            "start": 1 if self.start_after_create else 0,
+            # net0, net1, … merged into the same literal build
+            **{
+                f"net{idx}": nic.to_proxmox_string(iface_index=idx)
+                for idx, nic in enumerate(self.nics)
+            },
+        }
+        # Order-preserving dedupe of all NIC nameservers in one pass
+        dns_servers = dict.fromkeys(
+            chain.from_iterable(nic.dns.split() for nic in self.nics if nic.dns)
+        )
+        if dns_servers:
+            params["nameserver"] = " ".join(dns_servers)
+        return params
+
+
+@router.post("/nodes/{node}/lxc", status_code=202, dependencies=[Depends(valid_node)])
+async def create_container(node: str, req: CreateLXCRequest, response: Response) -> Dict[str, Any]:
     """Create a new LXC container. Returns task UPID."""
-    params: Dict[str, Any] = {
-        "vmid": req.vmid,
-        "hostname": req.hostname,
-        "cores": req.cores,
-        "memory": req.memory,
-        "swap": req.swap,
-        "rootfs": f"{req.storage}:{req.disk_size}",
-        "ostemplate": req.template,
-        "password": req.password,
-        "unprivileged": 1 if req.unprivileged else 0,
-        "start": 1 if req.start_after_create else 0,
-    }
-    # Attach all NICs (net0, net1, …) and collect DNS
-    dns_servers: list[str] = []
-    for idx, nic in enumerate(req.nics):
-        params[f"net{idx}"] = nic.to_proxmox_string(iface_index=idx)
-        if nic.dns:
-            dns_servers.extend(nic.dns.split())
-
-    if dns_servers:
-        params["nameserver"] = " ".join(dict.fromkeys(dns_servers))  # deduplicated
+    upid = await _bounded(px_ct.create_container(node, req.to_proxmox_params()))
+    _invalidate(f"lxc:{node}")
+    _accepted(response, node, upid)
+    return {"upid": upid, "node": node, "vmid": req.vmid}
 
-    try:
-        upid = px_ct.create_container(node, params)
-        return {"upid": upid, "node": node, "vmid": req.vmid}
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=_proxmox_error(e))
 
-
-@router.post("/nodes/{node}/lxc/{vmid}/{action}", status_code=202)
-def container_action(
+@router.post("/nodes/{node}/lxc/{vmid}/{action}", status_code=202, dependencies=[Depends(valid_node)])
+async def container_action(
     node: str,
     vmid: int,
-    action: Literal["start", "stop", "reboot", "shutdown", "delete"],
+    action: Action,
+    response: Response,
 ) -> Dict[str, Any]:
     """Start, stop, reboot, shutdown, or delete a container."""
-    try:
-        upid = px_ct.action_container(node, vmid, action)
-        return {"upid": upid, "node": node, "vmid": vmid, "action": action}
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+    upid = await _bounded(px_ct.action_container(node, vmid, action))
+    _invalidate(f"lxc:{node}")
+    _accepted(response, node, upid)
+    return {"upid": upid, "node": node, "vmid": vmid, "action": action}
+
+
+# ---------------------------------------------------------------------------
+# Batch mutations
+# ---------------------------------------------------------------------------
+
+class VMCreateItem(CreateVMRequest):
+    op: Literal["create_vm"] = "create_vm"
+    node: str
+
+
+class VMActionItem(BaseModel):
+    op: Literal["vm_action"]
+    node: str
+    vmid: int
+    action: Action
+
+
+class LXCCreateItem(CreateLXCRequest):
+    op: Literal["create_lxc"] = "create_lxc"
+    node: str
+
+
+class LXCActionItem(BaseModel):
+    op: Literal["lxc_action"]
+    node: str
+    vmid: int
+    action: Action
+
+
+BatchItem = Annotated[
+    Union[VMCreateItem, VMActionItem, LXCCreateItem, LXCActionItem],
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem] = Field(..., min_length=1, max_length=64)
+
+
+async def _run_batch_item(item: "BatchItem") -> Dict[str, Any]:
+    if isinstance(item, VMCreateItem):
+        upid = await _bounded(px_vms.create_vm(item.node, item.to_proxmox_params()))
+        _invalidate(f"vms:{item.node}")
+        return {"upid": upid, "node": item.node, "vmid": item.vmid}
+    if isinstance(item, VMActionItem):
+        upid = await _bounded(px_vms.action_vm(item.node, item.vmid, item.action))
+        _invalidate(f"vms:{item.node}")
+        return {"upid": upid, "node": item.node, "vmid": item.vmid, "action": item.action}
+    if isinstance(item, LXCCreateItem):
+        upid = await _bounded(px_ct.create_container(item.node, item.to_proxmox_params()))
+        _invalidate(f"lxc:{item.node}")
+        return {"upid": upid, "node": item.node, "vmid": item.vmid}
+    upid = await _bounded(px_ct.action_container(item.node, item.vmid, item.action))
+    _invalidate(f"lxc:{item.node}")
+    return {"upid": upid, "node": item.node, "vmid": item.vmid, "action": item.action}
+
+
+@router.post("/batch", status_code=202)
+async def batch_mutations(req: BatchRequest) -> List[Dict[str, Any]]:
+    """Fan out up to 64 create/action operations concurrently.
+
+    Each result slot matches its request slot; failures come back as
+    ``{"error": ...}`` entries instead of failing the whole batch, so a
+    client starting 20 guests pays one round trip rather than 20.
+    """
+    results = await asyncio.gather(
+        *(_run_batch_item(item) for item in req.items), return_exceptions=True
+    )
+    out: List[Dict[str, Any]] = []
+    for r in results:
+        if isinstance(r, HTTPException):
+            out.append({"error": r.detail})
+        elif isinstance(r, BaseException):
+            out.append({"error": _proxmox_error(r)})
+        else:
+            out.append(r)
+    return out
 
 
 # ---------------------------------------------------------------------------
 # Templates
 # ---------------------------------------------------------------------------
 
-@router.get("/nodes/{node}/templates")
-def get_templates(node: str) -> List[Dict[str, Any]]:
+@router.get("/nodes/{node}/templates", dependencies=[Depends(valid_node)])
+async def get_templates(
+    request: Request,
+    node: str,
+    refresh: bool = Query(False, description="Bypass the cache and re-list from Proxmox"),
+) -> Response:
     """List available ISOs and LXC templates on the node."""
-    return px_tmpl.list_templates(node)
+    if refresh:
+        # Someone just uploaded an ISO/template — don't make them wait out the TTL.
+        _invalidate(f"templates:{node}")
+    return _etag_response(
+        request,
+        await _bounded(
+            _cached(
+                f"templates:{node}", _TEMPLATES_TTL, lambda: px_tmpl.list_templates(node)
+            )
+        ),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Task polling
 # ---------------------------------------------------------------------------
 
+def _normalize_task_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a node task-listing row onto the per-UPID status endpoint's shape.
+
+    The listing marks completion with ``endtime`` and carries the exit result
+    in ``status`` ("OK" or an error string); running rows have neither field.
+    Everything downstream — the long-poll loop, the terminal-task cache, the
+    frontend — speaks the status endpoint's running/stopped vocabulary, so
+    translate before handing rows to pollers.
+    """
+    if "endtime" not in row:
+        return {**row, "status": "running"}
+    return {**row, "status": "stopped", "exitstatus": row.get("status", "OK")}
+
+
+class _TaskPollBatcher:
+    """Batch concurrent task-status polls per node into one tasks listing.
+
+    Callers register their UPID and share a future; after a 50 ms window one
+    ``GET /nodes/{node}/tasks`` resolves the whole batch, so K pollers on the
+    same node cost one upstream round trip per window instead of K.
+    """
+
+    def __init__(self, window: float = 0.05):
+        self.window = window
+        self._pending: Dict[str, Dict[str, "asyncio.Future"]] = {}
+        self._flushers: Dict[str, "asyncio.Task"] = {}
+
+    async def submit(self, node: str, upid: str) -> Dict[str, Any]:
+        pending = self._pending.setdefault(node, {})
+        fut = pending.get(upid)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            pending[upid] = fut
+        if node not in self._flushers:
+            self._flushers[node] = asyncio.create_task(self._flush(node))
+        # shield: two pollers of the same UPID share this future — one being
+        # cancelled must not cancel the other's result. _flush's fut.done()
+        # guards tolerate a future every waiter has abandoned.
+        return await asyncio.shield(fut)
+
+    async def _flush(self, node: str) -> None:
+        await asyncio.sleep(self.window)
+        pending = self._pending.pop(node, {})
+        self._flushers.pop(node, None)
+        try:
+            rows = await px_vms.list_node_tasks(node)
+        except Exception as e:
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        by_upid = {r.get("upid"): r for r in rows}
+        for upid, fut in pending.items():
+            if fut.done():
+                continue
+            row = by_upid.get(upid)
+            if row is None:
+                # Aged out of the node's task list — poll it individually.
+                # Individual polls already arrive in status-endpoint shape.
+                try:
+                    row = await px_vms.get_task_status(node, upid)
+                except Exception as e:
+                    fut.set_exception(e)
+                    continue
+            else:
+                row = _normalize_task_row(row)
+            fut.set_result(row)
+
+
+_task_batcher = _TaskPollBatcher()
+
+# Finished tasks are immutable — once Proxmox reports status "stopped" the
+# record never changes, so late or duplicate polls can be answered locally.
+_TASK_TTL = 600.0  # seconds
+_task_cache: Dict[tuple, tuple] = {}  # (node, upid) -> (expires_at, result)
+
+
 @router.get("/tasks/{node}/{upid:path}")
-def get_task(node: str, upid: str) -> Dict[str, Any]:
-    """Poll a Proxmox task by UPID. Returns status and exitstatus when done."""
-    try:
-        return px_vms.get_task_status(node, upid)
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=str(e))
+async def get_task(
+    node: str,
+    upid: str,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll up to this many seconds for completion"),
+) -> Dict[str, Any]:
+    """Poll a Proxmox task by UPID. Returns status and exitstatus when done.
+
+    With ``wait`` > 0 the request holds until the task leaves ``running`` or
+    the window elapses, so clients get completion at upstream latency instead
+    of their polling interval.
+    """
+    key = (node, upid)
+    hit = _task_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    deadline = time.monotonic() + wait
+    delay = 0.25
+    while True:
+        if settings.proxmox_mock:
+            # Mock UPIDs resolve instantly — no point riding the batch window.
+            result = await px_vms.get_task_status(node, upid)
+        else:
+            result = await _bounded(_task_batcher.submit(node, upid))
+        remaining = deadline - time.monotonic()
+        if result.get("status") != "running" or remaining <= 0:
+            break
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 2.0)
+    if result.get("status") == "stopped":
+        if len(_task_cache) > 512:
+            now = time.monotonic()
+            for k in [k for k, (exp, _) in _task_cache.items() if exp <= now]:
+                del _task_cache[k]
+        _task_cache[key] = (time.monotonic() + _TASK_TTL, result)
+    return result
@@ -2,13 +2,16 @@
 """FastAPI router — resource reservations and iCAL export."""
 
 import datetime
+import hashlib
+import time
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import PlainTextResponse
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select, and_
+from sqlalchemy import func, insert, literal, select, update, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-from icalendar import Calendar, Event, vText, vDatetime
 
 from api.db import get_db
 from api.models import Reservation, ReservationStatus, ResourceType
@@ -39,7 +42,16 @@ class ReservationUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+# Columns a PATCH may not null out — derived from the table so the guard
+# can't drift from the schema.
+_REQUIRED_COLUMNS = frozenset(
+    c.name for c in Reservation.__table__.columns if not c.nullable
+)
+
+
 def _to_dict(r: Reservation) -> Dict[str, Any]:
+    # datetimes are left as-is: orjson serializes them natively to ISO-8601,
+    # so no per-row Python-level isoformat() calls.
     return {
         "id": r.id,
         "title": r.title,
@@ -47,31 +59,105 @@ def _to_dict(r: Reservation) -> Dict[str, Any]:
         "resource_type": r.resource_type,
         "proxmox_node": r.proxmox_node,
         "vmid": r.vmid,
-        "start_dt": r.start_dt.isoformat(),
-        "end_dt": r.end_dt.isoformat(),
+        "start_dt": r.start_dt,
+        "end_dt": r.end_dt,
         "status": r.status,
         "notes": r.notes,
     }
 
 
+# Rendered list responses are cached for a few seconds — dashboards and
+# calendar clients poll with identical windows, so the steady state becomes a
+# dict lookup. Any write bumps the version, which orphans every cached entry.
+_RENDER_TTL = 10.0
+_data_version = 0
+_render_cache: Dict[tuple, tuple] = {}
+
+
+def _mark_changed() -> None:
+    global _data_version
+    _data_version += 1
+    _render_cache.clear()
+
+
+def _render_get(key: tuple):
+    entry = _render_cache.get((_data_version, *key))
+    if entry is not None and time.monotonic() - entry[0] < _RENDER_TTL:
+        return entry[1:]
+    return None
+
+
+def _render_put(key: tuple, *value) -> None:
+    # Keys embed client-supplied windows (rolling now-based start/end), so
+    # between writes the dict would grow without bound — drop expired and
+    # stale-version entries once it gets big, as inventory's cache does.
+    if len(_render_cache) > 256:
+        now = time.monotonic()
+        for k in [
+            k
+            for k, entry in _render_cache.items()
+            if k[0] != _data_version or now - entry[0] >= _RENDER_TTL
+        ]:
+            del _render_cache[k]
+    _render_cache[(_data_version, *key)] = (time.monotonic(), *value)
+
+
+async def _change_etag(db: AsyncSession, stmt, *parts) -> str:
+    """ETag from MAX(updated_at) + COUNT(*) plus any request-scoped parts.
+
+    One tiny aggregate query decides whether a poll can be answered with a
+    bare 304 before any rows are loaded or serialized.
+    """
+    mx, count = (await db.execute(stmt)).one()
+    key = repr((mx, count, parts)).encode()
+    return f'"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+
+
 # ---------------------------------------------------------------------------
 # CRUD
 # ---------------------------------------------------------------------------
 
 @router.get("/")
 async def list_reservations(
-    start: Optional[str] = None,
-    end: Optional[str] = None,
+    request: Request,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db),
-) -> List[Dict[str, Any]]:
-    """List reservations, optionally filtered by date range."""
-    stmt = select(Reservation)
-    if start:
-        stmt = stmt.where(Reservation.end_dt >= datetime.datetime.fromisoformat(start))
-    if end:
-        stmt = stmt.where(Reservation.start_dt <= datetime.datetime.fromisoformat(end))
-    result = await db.execute(stmt)
-    return [_to_dict(r) for r in result.scalars().all()]
+) -> Response:
+    """List reservations, optionally filtered by date range.
+
+    Paginated — clients wanting the full table should page through it (or
+    use the iCAL export, which streams) rather than materializing every
+    row in one response.
+    """
+    key = ("list", start, end, limit, offset)
+    cached = _render_get(key)
+    if cached is not None:
+        body, etag = cached
+    else:
+        stmt = select(Reservation).order_by(Reservation.id).limit(limit).offset(offset)
+        agg = select(func.max(Reservation.updated_at), func.count())
+        if start:
+            cond = Reservation.end_dt >= start
+            stmt, agg = stmt.where(cond), agg.where(cond)
+        if end:
+            cond = Reservation.start_dt <= end
+            stmt, agg = stmt.where(cond), agg.where(cond)
+
+        etag = await _change_etag(db, agg, start, end, limit, offset)
+        result = await db.execute(stmt)
+        # Serialized once with orjson — no jsonable_encoder pass, and the
+        # bytes are reusable for every poll within the TTL.
+        body = orjson.dumps([_to_dict(r) for r in result.scalars().all()])
+        _render_put(key, body, etag)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=body, media_type="application/json", headers={"ETag": etag}
+    )
 
 
 @router.post("/", status_code=201)
@@ -82,27 +168,57 @@ async def create_reservation(
     if body.end_dt <= body.start_dt:
         raise HTTPException(status_code=400, detail="end_dt must be after start_dt")
 
-    # Conflict check: same node, overlapping window, not cancelled
+    # Conflict check and insert as one statement: INSERT ... SELECT ... WHERE
+    # NOT EXISTS (overlap on the same node, not cancelled). A separate SELECT
+    # followed by an INSERT lets two concurrent POSTs both pass the check and
+    # both land; pushing the predicate into the INSERT closes that race and
+    # saves a round trip.
     if body.proxmox_node:
-        conflict_stmt = select(Reservation).where(
-            and_(
-                Reservation.proxmox_node == body.proxmox_node,
-                Reservation.status != ReservationStatus.cancelled,
-                Reservation.start_dt < body.end_dt,
-                Reservation.end_dt > body.start_dt,
-            )
+        overlap = and_(
+            Reservation.proxmox_node == body.proxmox_node,
+            Reservation.status != ReservationStatus.cancelled,
+            Reservation.start_dt < body.end_dt,
+            Reservation.end_dt > body.start_dt,
         )
-        conflict = (await db.execute(conflict_stmt)).scalars().first()
-        if conflict:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Conflicts with existing reservation #{conflict.id} ('{conflict.title}')",
+        values = body.model_dump()
+        values["status"] = ReservationStatus.pending.value
+        table = Reservation.__table__
+        source = select(
+            *(literal(v, table.c[k].type) for k, v in values.items())
+        ).where(~select(Reservation.id).where(overlap).limit(1).exists())
+        result = await db.execute(
+            insert(Reservation)
+            .from_select(list(values), source)
+            .returning(Reservation)
+        )
+        r = result.scalar_one_or_none()
+        if r is None:
+            await db.rollback()
+            # Only the id and title feed the 409 message — no point hydrating
+            # a full Reservation for it.
+            conflict = (
+                await db.execute(
+                    select(Reservation.id, Reservation.title).where(overlap).limit(1)
+                )
+            ).first()
+            detail = (
+                f"Conflicts with existing reservation #{conflict.id} ('{conflict.title}')"
+                if conflict
+                else "Conflicts with an existing reservation"
             )
+            raise HTTPException(status_code=409, detail=detail)
+        await db.commit()
+        _mark_changed()
+        return _to_dict(r)
 
-    r = Reservation(**body.model_dump())
-    db.add(r)
+    # No node means no conflict predicate — still a single INSERT, with
+    # RETURNING populating the defaults instead of a refresh SELECT.
+    result = await db.execute(
+        insert(Reservation).values(**body.model_dump()).returning(Reservation)
+    )
+    r = result.scalar_one()
     await db.commit()
-    await db.refresh(r)
+    _mark_changed()
     return _to_dict(r)
 
 
@@ -123,10 +239,18 @@ async def update_reservation(
     r = await db.get(Reservation, reservation_id)
     if not r:
         raise HTTPException(status_code=404, detail="Reservation not found")
-    for field, value in body.model_dump(exclude_none=True).items():
+    # model_fields_set names only the fields the client actually sent — no
+    # model_dump() dict build. Explicit nulls apply to nullable columns;
+    # nulling a required column would only trade a 422 for a 500, so those
+    # are skipped.
+    for field in body.model_fields_set:
+        value = getattr(body, field)
+        if value is None and field in _REQUIRED_COLUMNS:
+            continue
         setattr(r, field, value)
     await db.commit()
     await db.refresh(r)
+    _mark_changed()
     return _to_dict(r)
 
 
@@ -134,35 +258,93 @@ async def update_reservation(
 async def cancel_reservation(
     reservation_id: int, db: AsyncSession = Depends(get_db)
 ) -> None:
-    r = await db.get(Reservation, reservation_id)
-    if not r:
-        raise HTTPException(status_code=404, detail="Reservation not found")
-    r.status = ReservationStatus.cancelled
+    # Single-column state flip — one UPDATE instead of SELECT + UPDATE, and
+    # no ORM row materialization. rowcount doubles as the existence check.
+    result = await db.execute(
+        update(Reservation)
+        .where(Reservation.id == reservation_id)
+        .values(status=ReservationStatus.cancelled)
+        .execution_options(synchronize_session=False)
+    )
     await db.commit()
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    _mark_changed()
 
 
 # ---------------------------------------------------------------------------
 # iCAL export
 # ---------------------------------------------------------------------------
 
-@router.get("/export/ical", response_class=PlainTextResponse)
-async def export_ical(db: AsyncSession = Depends(get_db)) -> str:
-    """Export all non-cancelled reservations as an iCAL feed."""
-    stmt = select(Reservation).where(
-        Reservation.status != ReservationStatus.cancelled
+_ICAL_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Direttore//Lab Scheduler//EN\r\n"
+)
+
+# The event schema is fixed, so the VEVENT is plain string formatting —
+# no Calendar/Event objects or per-property parsing on the export path.
+_EVENT_TMPL = (
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}\r\n"
+    "DTSTART:{start}\r\n"
+    "DTEND:{end}\r\n"
+    "SUMMARY:{summary}\r\n"
+    "DESCRIPTION:{desc}\r\n"
+    "END:VEVENT\r\n"
+)
+_DT_FMT = "%Y%m%dT%H%M%SZ"
+# RFC 5545 TEXT escaping for backslash, semicolon, comma and newline.
+_ICAL_ESCAPE = str.maketrans(
+    {"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": ""}
+)
+
+
+def _ical_event(r: Reservation) -> str:
+    summary = f"[{r.resource_type.upper()}] {r.title}"
+    desc = f"Requester: {r.requester}\nNode: {r.proxmox_node}\nVMID: {r.vmid}\n{r.notes or ''}"
+    return _EVENT_TMPL.format(
+        uid=f"{r.id}@direttore",
+        start=r.start_dt.strftime(_DT_FMT),
+        end=r.end_dt.strftime(_DT_FMT),
+        summary=summary.translate(_ICAL_ESCAPE),
+        desc=desc.translate(_ICAL_ESCAPE),
+    )
+
+
+@router.get("/export/ical")
+async def export_ical(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> Response:
+    """Export all non-cancelled reservations as an iCAL feed.
+
+    Streamed one VEVENT at a time over a server-side cursor so the export
+    stays O(1) in memory regardless of table size and the client sees the
+    first bytes before the last row is read.
+    """
+    active = Reservation.status != ReservationStatus.cancelled
+    # Calendar clients poll on a timer; most polls see unchanged data, so
+    # answer those with a 304 off one aggregate query — or, within the TTL,
+    # off the cached tag alone. The 200 body still streams row by row.
+    cached = _render_get(("ical",))
+    if cached is not None:
+        (etag,) = cached
+    else:
+        etag = await _change_etag(
+            db, select(func.max(Reservation.updated_at), func.count()).where(active)
+        )
+        _render_put(("ical",), etag)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    stmt = select(Reservation).where(active).execution_options(yield_per=500)
+
+    async def generate():
+        yield _ICAL_HEADER
+        async for r in await db.stream_scalars(stmt):
+            yield _ical_event(r)
+        yield "END:VCALENDAR\r\n"
+
+    return StreamingResponse(
+        generate(), media_type="text/calendar", headers={"ETag": etag}
     )
-    result = await db.execute(stmt)
-    reservations = result.scalars().all()
-
-    cal = Calendar()
-    cal.add('prodid', '-//Direttore//Lab Scheduler//EN')
-    cal.add('version', '2.0')
-    for r in reservations:
-        e = Event()
-        e.add('summary', f"[{r.resource_type.upper()}] {r.title}")
-        e.add('dtstart', r.start_dt)
-        e.add('dtend', r.end_dt)
-        e.add('description', f"Requester: {r.requester}\nNode: {r.proxmox_node}\nVMID: {r.vmid}\n{r.notes or ''}")
-        e.add('uid', f"{r.id}@direttore")
-        cal.add_component(e)
-    return cal.to_ical().decode('utf-8')